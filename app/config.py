@@ -6,7 +6,7 @@ Uses Pydantic Settings for type-safe configuration management.
 """
 
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -15,16 +15,33 @@ class Settings(BaseSettings):
     
     Attributes:
         DATABASE_URL: Connection string for the database
+        DB_POOL_SIZE: Number of persistent connections kept in the pool
+        DB_MAX_OVERFLOW: Extra connections allowed above DB_POOL_SIZE
+        DB_POOL_RECYCLE: Seconds after which a pooled connection is replaced
+        DB_POOL_TIMEOUT: Seconds to wait for a free connection before failing
+        DB_QUERY_CACHE_SIZE: Number of compiled SQL statements cached per engine
+        AUTO_CREATE_TABLES: Create missing tables on startup (only with DEBUG)
+        REDIS_URL: Redis connection string for response caching (in-memory if unset)
         SECRET_KEY: Secret key for JWT token signing
         ALGORITHM: Algorithm used for JWT encoding
         ACCESS_TOKEN_EXPIRE_MINUTES: Token expiration time in minutes
         DEBUG: Enable debug mode
+        CORS_ORIGINS: Origins allowed to make cross-origin requests
         APP_NAME: Application name shown in docs
         APP_VERSION: Current API version
     """
     
     # Database settings
-    DATABASE_URL: str = "sqlite:///./ecommerce.db"
+    DATABASE_URL: str = "sqlite+aiosqlite:///./ecommerce.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_TIMEOUT: int = 30
+    DB_QUERY_CACHE_SIZE: int = 1200
+    AUTO_CREATE_TABLES: bool = False
+    
+    # Cache settings
+    REDIS_URL: Optional[str] = None
     
     # JWT settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -33,6 +50,7 @@ class Settings(BaseSettings):
     
     # Application settings
     DEBUG: bool = True
+    CORS_ORIGINS: list[str] = ["http://localhost:3000"]
     APP_NAME: str = "E-commerce API"
     APP_VERSION: str = "1.0.0"
     
@@ -42,14 +60,13 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-@lru_cache()
+# Global settings instance, loaded once at import time
+settings = Settings()
+
+
 def get_settings() -> Settings:
     """
-    Get cached settings instance.
-    Using lru_cache ensures settings are loaded only once.
+    Get the global settings instance.
+    Kept for use with Depends(); returns the module-level object directly.
     """
-    return Settings()
-
-
-# Global settings instance
-settings = get_settings()
+    return settings
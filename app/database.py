@@ -1,36 +1,59 @@
 """
 Database Configuration
 
-Sets up SQLAlchemy engine, session, and base model.
+Sets up the async SQLAlchemy engine, session, and base model.
 Provides dependency injection for database sessions.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import StaticPool
+from typing import AsyncGenerator
 
 from app.config import settings
 
 
-# Create SQLAlchemy engine
-# For SQLite, we need connect_args to allow multi-threading
+# Create async SQLAlchemy engine
+# DATABASE_URL must use an async driver:
+#   postgresql+asyncpg://...  or  sqlite+aiosqlite:///...
+# query_cache_size bounds the compiled statement cache; it is sized so
+# every variant of the product queries stays cached.
 if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
+    sqlite_kwargs = {}
+    if ":memory:" in settings.DATABASE_URL:
+        # In-memory databases live inside a single connection,
+        # so every session has to share it
+        sqlite_kwargs["poolclass"] = StaticPool
+    engine = create_async_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}  # SQLite specific
+        connect_args={"check_same_thread": False},  # SQLite specific
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        **sqlite_kwargs
     )
 else:
     # PostgreSQL or other databases
-    engine = create_engine(settings.DATABASE_URL)
+    # pool_pre_ping drops connections the server closed while idle and
+    # pool_recycle replaces them before typical server/proxy timeouts
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    )
 
 
 # Create SessionLocal class
-# Each instance of SessionLocal will be a database session
-SessionLocal = sessionmaker(
-    autocommit=False,
+# Each instance of SessionLocal will be an async database session.
+# expire_on_commit=False keeps attributes loaded after commit, so
+# returning an ORM object from a route doesn't trigger a lazy refresh.
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False,
 )
 
 
@@ -39,20 +62,25 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency that provides a database session.
+    Dependency that provides an async database session.
     
     Yields a database session and ensures it's closed after use.
     Use this with FastAPI's Depends() for dependency injection.
     
+    Each session holds one pooled connection for the duration of the
+    request, so DB_POOL_SIZE + DB_MAX_OVERFLOW bounds how many requests
+    a single uvicorn worker can serve concurrently. Size the pool for the
+    expected per-worker concurrency, and keep
+    (--workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)) below the database's
+    max_connections.
+    
     Example:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -10,25 +10,44 @@ Email: kingehtsham0@gmail.com
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 
 from app.config import settings
 from app.database import engine, Base
 from app.routers import auth, products
+from app.utils.cache import init_cache
 
 
-# Create database tables on startup
+# Warm up the database pool on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for startup and shutdown events.
-    Creates database tables when the application starts.
+    Checks the database connection and initializes the response cache
+    when the application starts.
+    
+    The schema is managed by Alembic (`alembic upgrade head`), not here.
+    For local development, set DEBUG and AUTO_CREATE_TABLES to create
+    missing tables on startup instead.
     """
-    # Startup: Create database tables
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully")
+    if settings.DEBUG and settings.AUTO_CREATE_TABLES:
+        # Startup: Create database tables (development only)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        print("✅ Database tables created successfully")
+    
+    # Startup: Open a first pooled connection
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    print("✅ Database connection established")
+    
+    # Startup: Initialize response cache
+    init_cache()
     yield
     # Shutdown: Clean up resources if needed
+    await engine.dispose()
     print("👋 Application shutting down")
 
 
@@ -50,19 +69,24 @@ app = FastAPI(
     """,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 
 # Configure CORS middleware
-# This allows frontend applications to make requests to our API
+# This allows frontend applications to make requests to our API.
+# Origins come from settings; a set makes the per-request origin check
+# a hash lookup. Explicit methods and headers avoid the wildcard
+# handling (and wildcards are not allowed with credentials anyway).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=frozenset(origin.lower() for origin in settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["authorization", "content-type", "if-none-match"],
+    expose_headers=["etag"],
 )
 
 
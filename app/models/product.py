@@ -4,13 +4,21 @@ Product Model
 Defines the Product database model for e-commerce functionality.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index, DDL, Uuid, event, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+# Full-text document used by product search. Kept as raw SQL so the
+# expression index below and the search query match exactly, which is
+# what lets PostgreSQL use the index.
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+
 class Product(Base):
     """
     Product model for e-commerce catalog.
@@ -25,11 +33,41 @@ class Product(Base):
         image_url: URL to product image
         is_active: Whether product is available for sale
         owner_id: Foreign key to the user who created the product
+        client_id: Client-generated UUID supplied at creation
         created_at: Product creation timestamp
         updated_at: Last update timestamp
     """
     
     __tablename__ = "products"
+    # Fetch server-generated values (id, created_at) with RETURNING as part
+    # of the INSERT, so no refresh query is needed afterwards
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Match the WHERE clauses used by the list endpoints so filtering
+        # by category and/or price range is a single index range scan
+        Index("ix_products_active_category_price", "is_active", "category", "price"),
+        Index("ix_products_active_price", "is_active", "price"),
+        # Trigram indexes let PostgreSQL serve ILIKE '%term%' searches
+        # from an index instead of a sequential scan
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_products_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # GIN index over the full-text document for word/stemmed search
+        Index(
+            "ix_products_search_document",
+            text(SEARCH_DOCUMENT_SQL),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -47,17 +85,31 @@ class Product(Base):
     image_url = Column(String(500), nullable=True)
     
     # Status
-    is_active = Column(Boolean, default=True)
+    is_active = Column(Boolean, default=True, index=True)
     
     # Foreign keys
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
+    # Client-generated ID for products created in the background
+    client_id = Column(Uuid, nullable=True, unique=True, index=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    owner = relationship("User", back_populates="products")
+    # lazy="raise" turns accidental per-row lazy loads (N+1) into errors;
+    # load explicitly with selectinload(Product.owner) when needed
+    owner = relationship("User", back_populates="products", lazy="raise")
     
     def __repr__(self):
         return f"<Product(id={self.id}, name={self.name}, price={self.price})>"
+
+
+# The trigram indexes above need the pg_trgm extension to exist
+# before the products table (and its indexes) are created
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -18,7 +18,7 @@ class User(Base):
     Attributes:
         id: Primary key
         email: Unique email address (used for login)
-        hashed_password: Bcrypt hashed password
+        hashed_password: Argon2 (or legacy bcrypt) hashed password
         full_name: User's display name
         is_active: Whether the user account is active
         is_admin: Whether the user has admin privileges
@@ -27,6 +27,9 @@ class User(Base):
     """
     
     __tablename__ = "users"
+    # Fetch server-generated values (id, created_at) with RETURNING as part
+    # of the INSERT, so no refresh query is needed afterwards
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -47,7 +50,8 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    products = relationship("Product", back_populates="owner")
+    # lazy="raise" - load explicitly with selectinload(User.products)
+    products = relationship("Product", back_populates="owner", lazy="raise")
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
@@ -6,19 +6,20 @@ Handles user registration, login, and profile endpoints.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
-from app.utils.security import hash_password, verify_password, create_access_token, get_current_user
+from app.utils.security import hash_password_async, verify_and_update_password, create_access_token, get_current_user
 
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user account.
     
@@ -29,7 +30,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     Returns the created user data (without password).
     """
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,14 +41,13 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     # Create new user with hashed password
     new_user = User(
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         full_name=user_data.full_name
     )
     
-    # Save to database
+    # Save to database (id and created_at come back with the INSERT)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     
     return new_user
 
@@ -54,7 +55,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Authenticate user and return JWT access token.
@@ -65,10 +66,18 @@ async def login(
     Returns a JWT token for authenticating subsequent requests.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalar_one_or_none()
     
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # (hashing runs in a worker thread so the event loop isn't blocked)
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password(
+            form_data.password, user.hashed_password
+        )
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -82,8 +91,16 @@ async def login(
             detail="Account is deactivated"
         )
     
-    # Create access token with email as subject
-    access_token = create_access_token(data={"sub": user.email})
+    # Upgrade legacy (bcrypt) hashes now that we know the password
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
+    # Create access token with email as subject; id and admin flag are
+    # included so write endpoints can authorize without a user lookup
+    access_token = create_access_token(
+        data={"sub": user.email, "uid": user.id, "adm": user.is_admin}
+    )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -4,60 +4,245 @@ Products Router
 Handles all product CRUD operations and search functionality.
 """
 
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import logging
+import math
+from typing import NoReturn, Optional, Union
+from uuid import UUID
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, or_, func, literal_column, text, bindparam, lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from app.database import get_db
-from app.models.product import Product
-from app.models.user import User
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductList
-from app.utils.security import get_current_user
+from app.database import get_db, SessionLocal
+from app.models.product import Product, SEARCH_DOCUMENT_SQL
+from app.schemas.user import TokenData
+from app.schemas.product import (
+    ProductCreate,
+    ProductAccepted,
+    ProductUpdate,
+    ProductResponse,
+    ProductList,
+    ProductSummary,
+    ProductSummaryList,
+)
+from app.utils.security import get_current_user_claims
+from app.utils.cache import (
+    CATEGORIES_TTL,
+    PRODUCT_TTL,
+    product_cache_key,
+    categories_cache_key,
+    get_cached,
+    set_cached,
+    invalidate_product,
+    invalidate_categories,
+    etag_response,
+)
 
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=list[ProductResponse])
+
+# Loose index scan for distinct categories on PostgreSQL.
+# Each recursive step seeks to the next category greater than the last
+# one, so it touches one index entry per category instead of every row.
+CATEGORIES_LOOSE_SCAN = text("""
+    WITH RECURSIVE t AS (
+        (
+            SELECT category FROM products
+            WHERE is_active AND category IS NOT NULL
+            ORDER BY category LIMIT 1
+        )
+        UNION ALL
+        SELECT (
+            SELECT category FROM products
+            WHERE is_active AND category IS NOT NULL AND category > t.category
+            ORDER BY category LIMIT 1
+        )
+        FROM t
+        WHERE t.category IS NOT NULL
+    )
+    SELECT category FROM t WHERE category IS NOT NULL
+""")
+
+
+# Cached statements for the hot lookups. lambda_stmt builds and caches
+# the statement once; later executions only supply new parameters.
+GET_PRODUCT_STMT = lambda_stmt(
+    lambda: select(Product).where(Product.id == bindparam("product_id"))
+)
+PRODUCT_EXISTS_STMT = lambda_stmt(
+    lambda: select(Product.id).where(Product.id == bindparam("product_id"))
+)
+
+
+def add_product_filters(
+    stmt: StatementLambdaElement,
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+) -> StatementLambdaElement:
+    """
+    Append the optional list filters to a cached active-products statement.
+    
+    Each filter is its own lambda, so every combination of filters
+    gets its own cache entry and the values are passed as parameters.
+    """
+    if category:
+        stmt += lambda s: s.where(Product.category == category)
+    if min_price is not None:
+        stmt += lambda s: s.where(Product.price >= min_price)
+    if max_price is not None:
+        stmt += lambda s: s.where(Product.price <= max_price)
+    return stmt
+
+
+# Validates and serializes a whole page of products in one call
+PRODUCT_LIST_ADAPTER = TypeAdapter(list[ProductResponse])
+
+
+def writable_product_conditions(product_id: int, user: TokenData) -> list:
+    """
+    Build WHERE conditions matching a product the user may modify.
+    
+    Owners can modify their own products; admins can modify any product.
+    """
+    conditions = [Product.id == product_id]
+    if not user.is_admin:
+        conditions.append(Product.owner_id == user.id)
+    return conditions
+
+
+async def raise_not_found_or_forbidden(
+    db: AsyncSession, product_id: int, action: str
+) -> NoReturn:
+    """
+    Raise the right error after a guarded write matched no rows.
+    
+    Only runs on the failure path, so successful writes never pay
+    for a separate existence check.
+    """
+    exists = await db.scalar(PRODUCT_EXISTS_STMT, {"product_id": product_id})
+    
+    if exists is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with id {product_id} not found"
+        )
+    
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Not authorized to {action} this product"
+    )
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": Union[ProductList, ProductSummaryList]}},
+)
 async def get_products(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of items to return"),
     category: Optional[str] = Query(None, description="Filter by category"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
-    db: Session = Depends(get_db)
+    summary: bool = Query(False, description="Return only id, name, price and category"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Get a list of all active products with optional filtering.
+    Get a paginated list of all active products with optional filtering.
+    
+    The page and the total match count are fetched in a single query.
+    With **summary** set, only the listing columns are selected from the
+    database and returned.
     
     - **skip**: Number of items to skip for pagination
     - **limit**: Maximum number of items to return (max 100)
     - **category**: Filter products by category
     - **min_price**: Filter products with price >= min_price
     - **max_price**: Filter products with price <= max_price
+    - **summary**: Return compact items (id, name, price, category)
     """
-    # Start with base query for active products
-    query = db.query(Product).filter(Product.is_active == True)
+    # count(*) OVER () returns the total match count on every row
+    if summary:
+        stmt = lambda_stmt(
+            lambda: select(
+                Product.id,
+                Product.name,
+                Product.price,
+                Product.category,
+                func.count().over().label("total"),
+            )
+            .where(Product.is_active == True)
+        )
+    else:
+        stmt = lambda_stmt(
+            lambda: select(Product, func.count().over().label("total"))
+            .where(Product.is_active == True)
+        )
+    stmt = add_product_filters(stmt, category, min_price, max_price)
     
-    # Apply filters if provided
-    if category:
-        query = query.filter(Product.category == category)
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
+    # Apply pagination
+    stmt += lambda s: s.offset(skip).limit(limit)
+    result = await db.execute(stmt)
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Past the last page there is no row to carry the total
+        count_stmt = lambda_stmt(
+            lambda: select(func.count()).select_from(Product)
+            .where(Product.is_active == True)
+        )
+        count_stmt = add_product_filters(count_stmt, category, min_price, max_price)
+        total = await db.scalar(count_stmt)
+    else:
+        total = 0
+    
+    page_number = skip // limit + 1
+    pages = math.ceil(total / limit)
+    
+    if summary:
+        # Column values come straight from the database, so the summary
+        # schema can be built without re-validating every row
+        summary_page = ProductSummaryList.model_construct(
+            items=[
+                ProductSummary.model_construct(
+                    id=row.id, name=row.name, price=row.price, category=row.category
+                )
+                for row in rows
+            ],
+            total=total,
+            page=page_number,
+            pages=pages,
+        )
+        return Response(summary_page.model_dump_json(), media_type="application/json")
     
-    # Apply pagination and return results
-    products = query.offset(skip).limit(limit).all()
-    return products
+    # Serialize the whole page in one call instead of going through
+    # FastAPI's per-item response_model handling
+    page = ProductList.model_validate(
+        {
+            "items": [row[0] for row in rows],
+            "total": total,
+            "page": page_number,
+            "pages": pages,
+        },
+        from_attributes=True,
+    )
+    return Response(page.model_dump_json(), media_type="application/json")
 
 
-@router.get("/search", response_model=list[ProductResponse])
+@router.get("/search", response_model=None, responses={200: {"model": list[ProductResponse]}})
 async def search_products(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Number of results"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search products by name or description.
@@ -67,73 +252,196 @@ async def search_products(
     """
     # Search in name and description using LIKE
     search_term = f"%{q}%"
-    products = db.query(Product).filter(
-        Product.is_active == True,
-        or_(
-            Product.name.ilike(search_term),
-            Product.description.ilike(search_term)
+    conditions = [
+        Product.name.ilike(search_term),
+        Product.description.ilike(search_term),
+    ]
+    
+    # On PostgreSQL also match stemmed words via the full-text index;
+    # the LIKE conditions above are served by the trigram indexes
+    if db.bind.dialect.name == "postgresql":
+        search_document = literal_column(SEARCH_DOCUMENT_SQL)
+        conditions.append(
+            search_document.op("@@")(func.plainto_tsquery("english", q))
         )
-    ).limit(limit).all()
     
-    return products
+    stmt = select(Product).where(
+        Product.is_active == True,
+        or_(*conditions)
+    ).limit(limit)
+    result = await db.execute(stmt)
+    products = result.scalars().all()
+    
+    # Serialize all results in one call
+    items = PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True)
+    return Response(PRODUCT_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: Session = Depends(get_db)):
+@router.get("/{product_id}", response_model=None, responses={200: {"model": ProductResponse}})
+async def get_product(
+    product_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get a single product by its ID.
     
+    Responses are cached briefly and invalidated when the product changes.
+    Supports conditional GET: send the ETag back in If-None-Match to get
+    304 Not Modified when the product hasn't changed.
+    
     - **product_id**: The unique identifier of the product
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    cache_key = product_cache_key(product_id)
+    body = await get_cached(cache_key)
     
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id {product_id} not found"
-        )
+    if body is None:
+        result = await db.execute(GET_PRODUCT_STMT, {"product_id": product_id})
+        product = result.scalar_one_or_none()
+        
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with id {product_id} not found"
+            )
+        
+        body = ProductResponse.model_validate(product).model_dump_json().encode()
+        await set_cached(cache_key, body, PRODUCT_TTL)
     
-    return product
+    return etag_response(request, body, max_age=PRODUCT_TTL)
+
+
+async def client_id_exists(db: AsyncSession, client_id: UUID) -> bool:
+    """
+    Check whether a product with the given client_id is already saved.
+    
+    Used after an IntegrityError to tell a duplicate client_id apart
+    from other constraint failures (such as a missing owner).
+    """
+    existing = await db.scalar(select(Product.id).where(Product.client_id == client_id))
+    return existing is not None
+
+
+async def persist_product(product_data: ProductCreate, owner_id: int) -> None:
+    """
+    Save a product accepted by create_product in the background.
+    
+    Runs after the response is sent, so it uses its own session.
+    A duplicate client_id means the product was already saved (for
+    example by a client retry) and is ignored; any other failure is
+    logged and re-raised.
+    """
+    async with SessionLocal() as db:
+        db.add(Product(**product_data.model_dump(), owner_id=owner_id))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            if await client_id_exists(db, product_data.client_id):
+                return
+            logger.exception(
+                "Failed to save product with client_id %s", product_data.client_id
+            )
+            raise
+    
+    # A new category may have appeared
+    if product_data.category:
+        await invalidate_categories()
 
 
-@router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ProductResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": ProductAccepted}},
+)
 async def create_product(
     product_data: ProductCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Save in the background and return 202"),
+    current_user: TokenData = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new product.
     
     Requires authentication. The authenticated user becomes the product owner.
     
+    With **background** set, the request is only validated, the product
+    is saved after the response is sent, and 202 Accepted is returned
+    with the product's client_id. Poll
+    GET /products/by-client-id/{client_id} to get the saved product.
+    
     - **name**: Product name (required)
     - **description**: Product description
     - **price**: Product price (must be > 0)
     - **category**: Product category
     - **stock_quantity**: Initial stock quantity
     - **image_url**: URL to product image
+    - **client_id**: Optional client-generated UUID
     """
+    if background:
+        background_tasks.add_task(persist_product, product_data, current_user.id)
+        accepted = ProductAccepted(client_id=product_data.client_id)
+        return Response(
+            accepted.model_dump_json(),
+            status_code=status.HTTP_202_ACCEPTED,
+            media_type="application/json",
+        )
+    
     # Create new product with owner set to current user
     new_product = Product(
         **product_data.model_dump(),
         owner_id=current_user.id
     )
     
-    # Save to database
+    # Save to database (id and created_at come back with the INSERT)
     db.add(new_product)
-    db.commit()
-    db.refresh(new_product)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if not await client_id_exists(db, product_data.client_id):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Product with client_id {product_data.client_id} already exists"
+        )
+    
+    # A new category may have appeared
+    if new_product.category:
+        await invalidate_categories()
     
     return new_product
 
 
+@router.get("/by-client-id/{client_id}", response_model=ProductResponse)
+async def get_product_by_client_id(client_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Get a product by the client_id supplied when it was created.
+    
+    Returns 404 until a product created in the background has been saved.
+    
+    - **client_id**: The client-generated UUID of the product
+    """
+    result = await db.execute(select(Product).where(Product.client_id == client_id))
+    product = result.scalar_one_or_none()
+    
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with client_id {client_id} not found"
+        )
+    
+    return product
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
     product_data: ProductUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenData = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing product.
@@ -141,30 +449,38 @@ async def update_product(
     Requires authentication. Only the product owner or admin can update.
     Only provided fields will be updated.
     """
-    # Find the product
-    product = db.query(Product).filter(Product.id == product_id).first()
+    conditions = writable_product_conditions(product_id, current_user)
+    update_data = product_data.model_dump(exclude_unset=True)
     
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id {product_id} not found"
-        )
+    if not update_data:
+        # Nothing to change - just return the product if allowed
+        product = await db.scalar(select(Product).where(*conditions))
+        if product is None:
+            await raise_not_found_or_forbidden(db, product_id, "update")
+        return product
     
-    # Check ownership (owner or admin can update)
-    if product.owner_id != current_user.id and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this product"
-        )
+    # Update only provided fields; the ownership check is part of the
+    # WHERE clause and RETURNING hands back the fresh row
+    stmt = (
+        update(Product)
+        .where(*conditions)
+        .values(**update_data)
+        .returning(Product)
+    )
+    result = await db.execute(stmt)
+    product = result.scalar_one_or_none()
     
-    # Update only provided fields
-    update_data = product_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(product, field, value)
+    if product is None:
+        await db.rollback()
+        await raise_not_found_or_forbidden(db, product_id, "update")
     
     # Save changes
-    db.commit()
-    db.refresh(product)
+    await db.commit()
+    
+    # Drop stale cached copies
+    await invalidate_product(product_id)
+    if "category" in update_data or "is_active" in update_data:
+        await invalidate_categories()
     
     return product
 
@@ -172,8 +488,8 @@ async def update_product(
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenData = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a product.
@@ -181,37 +497,54 @@ async def delete_product(
     Requires authentication. Only the product owner or admin can delete.
     This performs a soft delete (sets is_active to False).
     """
-    # Find the product
-    product = db.query(Product).filter(Product.id == product_id).first()
+    # Soft delete - just mark as inactive, guarded by ownership
+    stmt = (
+        update(Product)
+        .where(*writable_product_conditions(product_id, current_user))
+        .values(is_active=False)
+        .returning(Product.category)
+    )
+    result = await db.execute(stmt)
+    deleted = result.first()
     
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id {product_id} not found"
-        )
+    if deleted is None:
+        await db.rollback()
+        await raise_not_found_or_forbidden(db, product_id, "delete")
     
-    # Check ownership
-    if product.owner_id != current_user.id and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this product"
-        )
+    await db.commit()
     
-    # Soft delete - just mark as inactive
-    product.is_active = False
-    db.commit()
+    # Drop stale cached copies
+    await invalidate_product(product_id)
+    if deleted.category:
+        await invalidate_categories()
     
     return None
 
 
-@router.get("/categories/list", response_model=list[str])
-async def get_categories(db: Session = Depends(get_db)):
+@router.get("/categories/list", response_model=None, responses={200: {"model": list[str]}})
+async def get_categories(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Get a list of all unique product categories.
+    
+    The list is cached and invalidated whenever a product's category
+    or active status changes. Supports conditional GET via ETag.
     """
-    categories = db.query(Product.category).filter(
-        Product.is_active == True,
-        Product.category != None
-    ).distinct().all()
+    cache_key = categories_cache_key()
+    body = await get_cached(cache_key)
+    
+    if body is None:
+        if db.bind.dialect.name == "postgresql":
+            result = await db.execute(CATEGORIES_LOOSE_SCAN)
+        else:
+            stmt = select(Product.category).where(
+                Product.is_active == True,
+                Product.category != None
+            ).distinct()
+            result = await db.execute(stmt)
+        
+        # Sorted so the body (and its ETag) is stable across queries
+        categories = sorted(cat for cat in result.scalars().all() if cat)
+        body = orjson.dumps(categories)
+        await set_cached(cache_key, body, CATEGORIES_TTL)
     
-    return [cat[0] for cat in categories if cat[0]]
+    return etag_response(request, body, max_age=CATEGORIES_TTL)
@@ -1,3 +1,3 @@
 # Schemas package
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductSummary, ProductAccepted
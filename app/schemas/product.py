@@ -4,9 +4,12 @@ Product Schemas
 Pydantic models for product data validation and serialization.
 """
 
+from __future__ import annotations
+
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
+from uuid import UUID, uuid4
 
 
 class ProductBase(BaseModel):
@@ -30,8 +33,10 @@ class ProductCreate(ProductBase):
         category: Product category
         stock_quantity: Initial stock count
         image_url: URL to product image
+        client_id: Client-generated ID, used to look up products saved
+            in the background (generated if not provided)
     """
-    pass
+    client_id: UUID = Field(default_factory=uuid4)
 
 
 class ProductUpdate(BaseModel):
@@ -56,12 +61,14 @@ class ProductResponse(ProductBase):
         id: Product's unique identifier
         is_active: Whether product is available
         owner_id: ID of the user who created the product
+        client_id: Client-generated ID supplied at creation
         created_at: Creation timestamp
         updated_at: Last update timestamp
     """
     id: int
     is_active: bool
     owner_id: int
+    client_id: Optional[UUID] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -69,9 +76,45 @@ class ProductResponse(ProductBase):
         from_attributes = True
 
 
+class ProductAccepted(BaseModel):
+    """
+    Schema for a product accepted for background creation.
+    
+    Attributes:
+        client_id: ID to poll with GET /products/by-client-id/{client_id}
+        status: Always "accepted"
+    """
+    client_id: UUID
+    status: str = "accepted"
+
+
 class ProductList(BaseModel):
     """Schema for paginated product list response."""
     items: list[ProductResponse]
     total: int
     page: int
     pages: int
+
+
+class ProductSummary(BaseModel):
+    """
+    Compact product schema for listing views.
+    
+    Attributes:
+        id: Product's unique identifier
+        name: Product name
+        price: Product price
+        category: Product category
+    """
+    id: int
+    name: str
+    price: float
+    category: Optional[str] = None
+
+
+class ProductSummaryList(BaseModel):
+    """Schema for paginated product summary list response."""
+    items: list[ProductSummary]
+    total: int
+    page: int
+    pages: int
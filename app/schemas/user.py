@@ -5,14 +5,37 @@ Pydantic models for user data validation and serialization.
 These schemas define the shape of data for API requests and responses.
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AfterValidator, BaseModel, Field, WithJsonSchema
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
+
+
+def _validate_email(value: str) -> str:
+    """
+    Validate and normalize an email address.
+    
+    email_validator is imported on first use rather than when the
+    schemas are defined, keeping it off the application import path.
+    """
+    from email_validator import EmailNotValidError, validate_email
+    
+    try:
+        return validate_email(value, check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        raise ValueError(f"value is not a valid email address: {e}")
+
+
+# Drop-in replacement for pydantic's EmailStr
+Email = Annotated[
+    str,
+    AfterValidator(_validate_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
 
 
 class UserBase(BaseModel):
     """Base schema with common user fields."""
-    email: EmailStr
+    email: Email
     full_name: Optional[str] = None
 
 
@@ -36,7 +59,7 @@ class UserLogin(BaseModel):
         email: User's email address
         password: User's password
     """
-    email: EmailStr
+    email: Email
     password: str
 
 
@@ -79,5 +102,9 @@ class TokenData(BaseModel):
     
     Attributes:
         email: Email extracted from token
+        id: User ID extracted from token
+        is_admin: Admin flag extracted from token
     """
     email: Optional[str] = None
+    id: Optional[int] = None
+    is_admin: bool = False
@@ -1,2 +1,11 @@
 # Utils package
-from app.utils.security import hash_password, verify_password, create_access_token, get_current_user
+from app.utils.security import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_and_update_password,
+    create_access_token,
+    get_current_user,
+    get_current_user_claims,
+)
+from app.utils.cache import init_cache, invalidate_product, invalidate_categories
@@ -0,0 +1,175 @@
+"""
+Cache Utilities
+
+Configures the response cache backend (fastapi-cache2) and provides
+helpers for caching serialized responses, invalidating them, and
+answering conditional GET requests with ETags.
+Uses Redis when REDIS_URL is set, otherwise an in-process memory cache.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from app.config import settings
+
+
+# Prefix applied to every cache key
+CACHE_PREFIX = "ecom-cache"
+
+# Namespaces used by the product endpoints
+CATEGORIES_NAMESPACE = "categories"
+PRODUCT_NAMESPACE = "product"
+
+# Time-to-live for cached responses, in seconds
+CATEGORIES_TTL = 600
+PRODUCT_TTL = 60
+
+
+def init_cache() -> None:
+    """
+    Initialize the FastAPICache backend.
+
+    Should be called once at application startup. The in-memory
+    backend only evicts expired entries when they are read, so it grows
+    with the number of distinct keys; set REDIS_URL in production.
+    """
+    if settings.REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+
+        redis = aioredis.from_url(settings.REDIS_URL)
+        backend = RedisBackend(redis)
+    else:
+        backend = InMemoryBackend()
+
+    FastAPICache.init(backend, prefix=CACHE_PREFIX)
+
+
+def product_cache_key(product_id: int) -> str:
+    """
+    Build the cache key for a single product.
+
+    Args:
+        product_id: ID of the product
+
+    Returns:
+        Full cache key including the global prefix
+    """
+    return f"{CACHE_PREFIX}:{PRODUCT_NAMESPACE}:{product_id}"
+
+
+def categories_cache_key() -> str:
+    """
+    Build the cache key for the category list.
+
+    Returns:
+        Full cache key including the global prefix
+    """
+    return f"{CACHE_PREFIX}:{CATEGORIES_NAMESPACE}:all"
+
+
+async def get_cached(key: str) -> Optional[bytes]:
+    """
+    Get a cached response body.
+
+    Args:
+        key: Full cache key
+
+    Returns:
+        The cached JSON body, or None on a cache miss
+    """
+    return await FastAPICache.get_backend().get(key)
+
+
+async def set_cached(key: str, body: bytes, expire: int) -> None:
+    """
+    Store a response body in the cache.
+
+    Args:
+        key: Full cache key
+        body: Serialized JSON body
+        expire: Time-to-live in seconds
+    """
+    await FastAPICache.get_backend().set(key, body, expire)
+
+
+async def delete_cached(key: str) -> None:
+    """
+    Remove a cached response body, if present.
+
+    Args:
+        key: Full cache key
+    """
+    try:
+        await FastAPICache.get_backend().clear(key=key)
+    except KeyError:
+        # InMemoryBackend deletes the key without checking for it;
+        # a key that isn't cached in this process has nothing to drop
+        pass
+
+
+async def invalidate_product(product_id: int) -> None:
+    """
+    Remove a cached product response.
+
+    Args:
+        product_id: ID of the product that changed
+    """
+    await delete_cached(product_cache_key(product_id))
+
+
+async def invalidate_categories() -> None:
+    """
+    Remove the cached category list.
+    """
+    await delete_cached(categories_cache_key())
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a weak ETag from a response body.
+
+    The tag is a content hash, so every worker computes the same value
+    for the same data.
+
+    Args:
+        body: Serialized response body
+
+    Returns:
+        Weak ETag header value
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_response(request: Request, body: bytes, max_age: int) -> Response:
+    """
+    Build a JSON response with ETag support.
+
+    Returns 304 Not Modified without a body when the client's
+    If-None-Match header already holds the current ETag.
+
+    Args:
+        request: Incoming request
+        body: Serialized JSON body
+        max_age: Seconds clients and proxies may reuse the response
+
+    Returns:
+        A 200 response with the body, or an empty 304 response
+    """
+    etag = make_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
@@ -2,9 +2,13 @@
 Security Utilities
 
 Provides password hashing, JWT token creation, and user authentication.
-Uses bcrypt for password hashing and python-jose for JWT handling.
+Uses argon2 for password hashing (bcrypt hashes are still accepted and
+upgraded on login) and python-jose for JWT handling.
 """
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -12,15 +16,33 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.schemas.user import TokenData
 
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context using argon2.
+# Hashes carry their scheme prefix ($argon2id$ / $2b$), so existing bcrypt
+# hashes keep verifying and are marked for rehashing.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
+
+# Dedicated pool for password hashing, sized to the CPU count.
+# Each argon2 hash uses 64 MiB (memory_cost), so running them on the shared
+# threadpool could allocate GBs in a login burst and starve other work.
+hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
 
 # OAuth2 scheme for extracting token from Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -28,7 +50,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 def hash_password(password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password using argon2.
     
     Args:
         password: Plain text password
@@ -53,6 +75,43 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the hashing pool.
+    
+    Hashing is deliberately slow; the hashing libraries release the GIL,
+    so running it in a worker thread keeps the event loop free.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, hash_password, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password in the hashing pool and check if it needs rehashing.
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+        
+    Returns:
+        Tuple of (password matches, new hash if the stored one uses an
+        outdated scheme or parameters, otherwise None)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -85,22 +144,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def decode_access_token(token: str) -> dict:
     """
-    Dependency to get the current authenticated user from JWT token.
+    Decode and validate a JWT access token.
     
     Args:
         token: JWT token from Authorization header
-        db: Database session
         
     Returns:
-        User object if authentication is successful
+        The token claims; "sub" is guaranteed to be present
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If the token is invalid or has no subject
     """
     # Exception for invalid credentials
     credentials_exception = HTTPException(
@@ -116,20 +171,46 @@ async def get_current_user(
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        
-        # Extract email from token
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-            
     except JWTError:
         raise credentials_exception
     
+    # Email is the token subject
+    if payload.get("sub") is None:
+        raise credentials_exception
+    
+    return payload
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Database session
+        
+    Returns:
+        User object if authentication is successful
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    payload = decode_access_token(token)
+    email: str = payload["sub"]
+    
     # Look up user in database
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
     
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     if not user.is_active:
         raise HTTPException(
@@ -138,3 +219,41 @@ async def get_current_user(
         )
     
     return user
+
+
+async def get_current_user_claims(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> TokenData:
+    """
+    Dependency to get the current user's identity from the JWT claims.
+    
+    For endpoints that only need the user's id and admin flag. Tokens
+    issued at login carry both, so no database query is made. Tokens
+    without them (issued before the claims were added) fall back to
+    a full user lookup.
+    
+    Note: account deactivation takes effect for these endpoints once
+    the token expires (ACCESS_TOKEN_EXPIRE_MINUTES).
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Database session (only used for older tokens)
+        
+    Returns:
+        TokenData with email, id and is_admin
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    payload = decode_access_token(token)
+    
+    if payload.get("uid") is not None:
+        return TokenData(
+            email=payload["sub"],
+            id=payload["uid"],
+            is_admin=payload.get("adm", False),
+        )
+    
+    user = await get_current_user(token, db)
+    return TokenData(email=user.email, id=user.id, is_admin=user.is_admin)
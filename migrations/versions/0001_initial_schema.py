@@ -0,0 +1,95 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_context().dialect.name == "postgresql"
+
+    # Users
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    # Products
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("stock_quantity", sa.Integer(), nullable=True),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+    op.create_index("ix_products_name", "products", ["name"])
+    op.create_index("ix_products_category", "products", ["category"])
+    op.create_index("ix_products_is_active", "products", ["is_active"])
+    op.create_index("ix_products_active_category_price", "products", ["is_active", "category", "price"])
+    op.create_index("ix_products_active_price", "products", ["is_active", "price"])
+
+    # PostgreSQL-only search indexes
+    if is_postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_products_name_trgm",
+            "products",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_products_description_trgm",
+            "products",
+            ["description"],
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_products_search_document",
+            "products",
+            [sa.text(SEARCH_DOCUMENT_SQL)],
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    # Dropping the table drops all of its indexes
+    op.drop_table("products")
+    op.drop_table("users")
@@ -0,0 +1,26 @@
+"""add products.client_id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("client_id", sa.Uuid(), nullable=True))
+    op.create_index("ix_products_client_id", "products", ["client_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_client_id", table_name="products")
+    op.drop_column("products", "client_id")
@@ -0,0 +1,76 @@
+"""
+Test Configuration
+
+Points the app at a throwaway SQLite database and provides an API
+client plus an authenticated user for the tests.
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# Settings are read at import time, so configure them before importing the app
+_db_dir = tempfile.mkdtemp()
+TEST_DB_PATH = os.path.join(_db_dir, "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
+os.environ["DEBUG"] = "true"
+os.environ["AUTO_CREATE_TABLES"] = "true"
+os.environ.pop("REDIS_URL", None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    """API client with the application lifespan running."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db_path():
+    """Path of the SQLite test database, for inspecting stored rows."""
+    return TEST_DB_PATH
+
+
+@pytest.fixture
+def register_user(client):
+    """
+    Return a function that registers and logs in a fresh user.
+
+    The function returns the user's email and Authorization header.
+    """
+    def register():
+        email = f"user-{uuid.uuid4().hex}@example.com"
+        password = "password123"
+
+        response = client.post(
+            "/auth/register", json={"email": email, "password": password}
+        )
+        assert response.status_code == 201
+
+        response = client.post(
+            "/auth/login", data={"username": email, "password": password}
+        )
+        assert response.status_code == 200
+
+        return email, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return register
+
+
+@pytest.fixture
+def auth_headers(register_user):
+    """Authorization header for a freshly registered user."""
+    return register_user()[1]
+
+
+
+@pytest.fixture
+def other_auth_headers(register_user):
+    """Authorization header for a second user who owns nothing."""
+    return register_user()[1]
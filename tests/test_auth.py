@@ -0,0 +1,116 @@
+"""
+Authentication Endpoint Tests
+
+Covers login, including the upgrade of legacy bcrypt password hashes,
+and authorization of product writes from the token's claims.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+from passlib.hash import bcrypt
+from sqlalchemy import event
+
+from app.database import engine
+from app.utils.security import create_access_token
+
+
+def stored_hash(db_path, email):
+    """Read a user's password hash straight from the database."""
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT hashed_password FROM users WHERE email = ?", (email,)
+        ).fetchone()
+    return row[0]
+
+
+def test_login_upgrades_bcrypt_hash(client, register_user, db_path):
+    """A user with a legacy bcrypt hash can log in and is rehashed with argon2."""
+    email, _ = register_user()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE users SET hashed_password = ? WHERE email = ?",
+            (bcrypt.hash("password123"), email),
+        )
+    assert stored_hash(db_path, email).startswith("$2b$")
+
+    response = client.post(
+        "/auth/login", data={"username": email, "password": "password123"}
+    )
+
+    assert response.status_code == 200
+    assert stored_hash(db_path, email).startswith("$argon2id$")
+
+
+@contextmanager
+def recorded_statements():
+    """Collect the SQL statements the app runs inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def reads_users(statements):
+    """Whether any of the statements queried the users table."""
+    return any("FROM users" in statement for statement in statements)
+
+
+def create_product(client, headers):
+    """Create a product and return its ID."""
+    response = client.post(
+        "/products/", json={"name": "Owned", "price": 10.0}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_login_token_writes_without_user_lookup(client, auth_headers):
+    """A token from /auth/login authorizes the owner from its claims alone."""
+    product_id = create_product(client, auth_headers)
+
+    with recorded_statements() as statements:
+        response = client.put(
+            f"/products/{product_id}", json={"price": 11.0}, headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    assert not reads_users(statements)
+
+
+def test_sub_only_token_falls_back_to_user_lookup(client, register_user):
+    """A token without uid/adm claims loads the user and still authorizes."""
+    email, headers = register_user()
+    product_id = create_product(client, headers)
+    legacy_headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': email})}"
+    }
+
+    with recorded_statements() as statements:
+        response = client.put(
+            f"/products/{product_id}", json={"price": 11.0}, headers=legacy_headers
+        )
+
+    assert response.status_code == 200
+    assert reads_users(statements)
+
+
+def test_non_admin_claims_cannot_modify_others_product(
+    client, auth_headers, other_auth_headers
+):
+    """A non-admin token cannot update or delete another user's product."""
+    product_id = create_product(client, auth_headers)
+
+    response = client.put(
+        f"/products/{product_id}", json={"price": 1.0}, headers=other_auth_headers
+    )
+    assert response.status_code == 403
+
+    response = client.delete(f"/products/{product_id}", headers=other_auth_headers)
+    assert response.status_code == 403
@@ -0,0 +1,131 @@
+"""
+Product Endpoint Tests
+
+Covers product writes, their authorization checks, and their
+interaction with the response cache.
+"""
+
+import uuid
+
+
+def create_product(client, auth_headers, **fields):
+    """Create a product and return its JSON body."""
+    data = {"name": "Test product", "price": 10.0, "category": "tests", **fields}
+    response = client.post("/products/", json=data, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_update_uncached_product(client, auth_headers):
+    """Updating a product that was never fetched (so never cached) succeeds."""
+    product = create_product(client, auth_headers)
+
+    response = client.put(
+        f"/products/{product['id']}", json={"price": 12.5}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["price"] == 12.5
+
+
+def test_delete_uncached_product(client, auth_headers):
+    """Deleting a product that was never fetched (so never cached) succeeds."""
+    product = create_product(client, auth_headers)
+
+    response = client.delete(f"/products/{product['id']}", headers=auth_headers)
+
+    assert response.status_code == 204
+
+
+def test_update_invalidates_cached_product(client, auth_headers):
+    """A cached product is refreshed after it is updated."""
+    product = create_product(client, auth_headers)
+    assert client.get(f"/products/{product['id']}").json()["price"] == 10.0
+
+    response = client.put(
+        f"/products/{product['id']}", json={"price": 20.0}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    assert client.get(f"/products/{product['id']}").json()["price"] == 20.0
+
+
+def test_update_by_non_owner_forbidden(client, auth_headers, other_auth_headers):
+    """Another user cannot update a product, and it is left unchanged."""
+    product = create_product(client, auth_headers)
+
+    response = client.put(
+        f"/products/{product['id']}", json={"price": 1.0}, headers=other_auth_headers
+    )
+
+    assert response.status_code == 403
+    assert client.get(f"/products/{product['id']}").json()["price"] == 10.0
+
+
+def test_empty_update_by_non_owner_forbidden(client, auth_headers, other_auth_headers):
+    """An update with no fields still checks ownership."""
+    product = create_product(client, auth_headers)
+
+    response = client.put(
+        f"/products/{product['id']}", json={}, headers=other_auth_headers
+    )
+
+    assert response.status_code == 403
+
+
+def test_delete_by_non_owner_forbidden(client, auth_headers, other_auth_headers):
+    """Another user cannot delete a product, and it stays active."""
+    product = create_product(client, auth_headers)
+
+    response = client.delete(f"/products/{product['id']}", headers=other_auth_headers)
+
+    assert response.status_code == 403
+    assert client.get(f"/products/{product['id']}").json()["is_active"] is True
+
+
+def test_write_missing_product_not_found(client, auth_headers):
+    """Updating or deleting a product that doesn't exist returns 404."""
+    response = client.put("/products/999999", json={"price": 1.0}, headers=auth_headers)
+    assert response.status_code == 404
+
+    response = client.delete("/products/999999", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_create_invalidates_cached_categories(client, auth_headers):
+    """A cached category list picks up a newly used category."""
+    category = f"cat-{uuid.uuid4().hex}"
+    assert category not in client.get("/products/categories/list").json()
+
+    create_product(client, auth_headers, category=category)
+
+    assert category in client.get("/products/categories/list").json()
+
+
+def test_duplicate_client_id_conflict(client, auth_headers):
+    """Reusing a client_id in the synchronous path returns 409."""
+    product = create_product(client, auth_headers)
+
+    response = client.post(
+        "/products/",
+        json={"name": "Again", "price": 5.0, "client_id": product["client_id"]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 409
+
+
+def test_background_create(client, auth_headers):
+    """Background creation returns 202 and the product can be polled by client_id."""
+    response = client.post(
+        "/products/?background=true",
+        json={"name": "Deferred", "price": 7.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    client_id = response.json()["client_id"]
+
+    # TestClient runs background tasks before returning the response
+    response = client.get(f"/products/by-client-id/{client_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Deferred"